@@ -16,6 +16,16 @@ from urllib.parse import quote
 # This will be set dynamically based on the user input
 BASE_CMD = None
 
+# Environment of the executed commands, None inherits the current one
+ENV = None
+
+if False:
+    ENV = {
+        **os.environ,
+        "http_proxy": "http://127.0.0.1:8080",
+        "https_proxy": "http://127.0.0.1:8080",
+    }
+
 
 def execute(command: str, timeout: float = None) -> str:
     """
@@ -29,15 +39,8 @@ def execute(command: str, timeout: float = None) -> str:
         str: Output of the command.
     """
 
-    env = os.environ.copy()
-
-    if False:
-        env['http_proxy'] = 'http://127.0.0.1:8080'
-        env['https_proxy'] = 'http://127.0.0.1:8080'
-
-
     return subprocess.check_output(
-        BASE_CMD.replace("||cmd||", quote(command)), stderr=subprocess.STDOUT, shell=True, timeout=timeout, env=env
+        BASE_CMD.replace("||cmd||", quote(command)), stderr=subprocess.STDOUT, shell=True, timeout=timeout, env=ENV
     ).decode("utf-8")
 
 
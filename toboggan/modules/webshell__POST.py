@@ -1,33 +1,33 @@
 # Buit-in imports
+import atexit
 import re
 
 # Third party library imports
 import httpx
 
+TRAILING_ESCAPES_PATTERN = re.compile(r"(\\[nt]|[\n\t])+$", flags=re.IGNORECASE)
+
+# Shared client, keeping the connection to the webshell alive between commands
+CLIENT = httpx.Client(
+    # ||BURP||
+    verify=False,
+)
+atexit.register(CLIENT.close)
+
 
 def execute(command: str, timeout: float = None) -> str:
-    response = httpx.post(
+    response = CLIENT.post(
         url="||URL||",
         data={
             "||PARAM_CMD||": command,
             # ||PARAMS||
         },
-        # ||BURP||
         timeout=timeout,
-        verify=False,
     )
 
     # Check if the request was successful
     response.raise_for_status()
 
-    # Trying to sanitize most of the webshells outputs
-    output = response.text
-
-    # Check if entire output consists only of escape sequences
-    if re.fullmatch(r"(\\[nt]|[\n\t])+", output, flags=re.IGNORECASE):
-        return ""
-
-    # If there's meaningful content, strip only the trailing escape sequences
-    output = re.sub(r"(\\[nt]|[\n\t])+$", "", output, flags=re.IGNORECASE)
-
-    return output
+    # Trying to sanitize most of the webshells outputs by stripping the trailing
+    # escape sequences, an output made only of them ends up empty
+    return TRAILING_ESCAPES_PATTERN.sub("", response.text)
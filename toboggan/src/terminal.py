@@ -1,10 +1,13 @@
+# Built-in imports
+import sys
+
 # Local library imports
 from toboggan.src import commands
 
 # Third party library imports
 from prompt_toolkit import PromptSession
-from prompt_toolkit.auto_suggest import ThreadedAutoSuggest, AutoSuggestFromHistory
-from prompt_toolkit.history import ThreadedHistory, InMemoryHistory
+from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+from prompt_toolkit.history import InMemoryHistory
 from prompt_toolkit.cursor_shapes import CursorShape
 
 
@@ -21,8 +24,8 @@ class Shell:
             multiline=False,
             enable_history_search=True,
             wrap_lines=True,
-            auto_suggest=ThreadedAutoSuggest(auto_suggest=AutoSuggestFromHistory()),
-            history=ThreadedHistory(history=InMemoryHistory()),
+            auto_suggest=AutoSuggestFromHistory(),
+            history=InMemoryHistory(),
         )
 
         self.__commands = commands
@@ -37,11 +40,17 @@ class Shell:
         result = None
         user_input = ""
         keyboard_interruption = 0
+
+        # Bind the methods used on every iteration once
+        prompt = self.__prompt_session.prompt
+        get_prompt = self.__commands.get_prompt
+        handle = self.__commands.handle
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+
         while True:
             try:
-                user_input = self.__prompt_session.prompt(
-                    message=self.__commands.get_prompt()
-                )
+                user_input = prompt(message=get_prompt())
                 if not user_input:
                     continue
             except KeyboardInterrupt:
@@ -59,5 +68,6 @@ class Shell:
                 continue
             else:
                 keyboard_interruption = 0
-                if result := self.__commands.handle(command=user_input):
-                    print(result, end="", flush=True)
+                if result := handle(command=user_input):
+                    write(result)
+                    flush()
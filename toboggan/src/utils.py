@@ -2,11 +2,17 @@
 from pathlib import Path
 import secrets
 import base64
-import io
+import binascii
 import gzip
+import zlib
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
 
+# Module variables definition
+
+# Window bits making zlib read and write the gzip format
+GZIP_WBITS = zlib.MAX_WBITS | 16
+
 
 def base64_for_powershell(command: str) -> str:
     # Encode the command as UTF-16LE, PowerShell's default encoding
@@ -16,10 +22,7 @@ def base64_for_powershell(command: str) -> str:
 
 def compress_with_gzip(command: str) -> bytes:
     # Compress command with GZip and return bytes
-    out = io.BytesIO()
-    with gzip.GzipFile(fileobj=out, mode="w") as f:
-        f.write(command.encode("utf-8"))
-    return out.getvalue()
+    return gzip.compress(command.encode("utf-8"))
 
 
 def aes_encrypt(command: str) -> tuple:
@@ -72,7 +75,10 @@ def yes_no_query(prompt: str = "") -> bool:
 
 def generate_random_token(min_length=3, max_length=6) -> str:
     token_length = secrets.randbelow(max_length - min_length + 1) + min_length
-    return secrets.token_hex(token_length // 2 + 1)[:token_length]
+    # Draw only the bytes needed to cover the hexadecimal length
+    return binascii.hexlify(secrets.token_bytes((token_length + 1) // 2))[
+        :token_length
+    ].decode("ascii")
 
 
 def random_float_in_range(